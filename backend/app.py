@@ -1,19 +1,25 @@
 # backend/app.py
 
 import os
+import re
+import math
 import json
+import threading
+import time
 import hashlib
 import qrcode
 from datetime import datetime
 from io import BytesIO
+from collections import deque
+import itertools
 import base64
 from PIL import Image
-from flask import Flask, request, jsonify, send_file, redirect, url_for, session
+from flask import Flask, Response, request, jsonify, send_file, redirect, url_for, session, has_request_context
 from flask_cors import CORS
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, DateTime, text
+from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Text, DateTime, UniqueConstraint, func, inspect, text
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fpdf import FPDF
 import requests
 from oauthlib.oauth2 import WebApplicationClient
@@ -21,8 +27,10 @@ from oauthlib.oauth2 import WebApplicationClient
 # Local imports
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from chain_utils import sha256_bytes, sha256_file, merkle_root
+from chain_utils import sha256_bytes, sha256_file, merkle_root, merkle_proof, verify_merkle_proof, anchor_leaf
 from crypto_utils import sign_hex, verify_hex
+from db_routing import ReplicaRouter
+from block_events import BlockBroadcaster
 
 # Flask app setup
 app = Flask(__name__)
@@ -45,6 +53,34 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
 
+# Optional read replicas (comma separated), used by read-only routes
+DATABASE_REPLICA_URLS = [u for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+router = ReplicaRouter(
+    engine,
+    DATABASE_REPLICA_URLS,
+    max_lag=int(os.getenv("REPLICA_MAX_LAG_BLOCKS", 0)),
+    check_interval=float(os.getenv("REPLICA_LAG_CHECK_SECONDS", 5)),
+    connect_timeout=int(os.getenv("REPLICA_CONNECT_TIMEOUT", 3)),
+    # Sub-chain appends and reports do not move the root chain tip, so track them too
+    tip_tables=("blocks", "subchain_blocks", "reports"),
+)
+
+
+def ReadSession(min_positions=None):
+    # Pin to the primary until replicas have caught up with this client's last writes
+    required = dict(session.get("last_writes", {}))
+    for table, row_id in (min_positions or {}).items():
+        required[table] = max(required.get(table, 0), row_id)
+    return router.reader(required)
+
+
+def note_write(table, row_id):
+    router.note_write(table, row_id)
+    if has_request_context():
+        last_writes = dict(session.get("last_writes", {}))
+        last_writes[table] = max(last_writes.get(table, 0), row_id)
+        session["last_writes"] = last_writes
+
 # Google OAuth setup
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_OAUTH_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET")
@@ -86,7 +122,11 @@ class Report(Base):
     description = Column(Text)
     file_hash = Column(String(256), nullable=False)
     signature = Column(Text)
+    # Root chain block id; None for reports placed on a sub-chain
     block_index = Column(Integer)
+    # Sub-chain placement as (chain_id, chain_height) for reports filed with a chain_id
+    chain_id = Column(String(128), nullable=True)
+    chain_height = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="reports")
@@ -120,9 +160,289 @@ class Transaction(Base):
     block = relationship("Block", back_populates="transactions")
 
 
+class SubChainBlock(Base):
+    __tablename__ = "subchain_blocks"
+    __table_args__ = (UniqueConstraint("chain_id", "height"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chain_id = Column(String(128), nullable=False, index=True)
+    height = Column(Integer, nullable=False)
+    block_hash = Column(String(256), unique=True, nullable=False)
+    previous_hash = Column(String(256))
+    data = Column(Text)
+    merkle_root = Column(String(256))
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+
+class SubChainAnchor(Base):
+    __tablename__ = "subchain_anchors"
+    # A sub-chain tip is anchored at most once, even if anchoring runs in several places
+    __table_args__ = (UniqueConstraint("chain_id", "height"),)
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chain_id = Column(String(128), nullable=False, index=True)
+    height = Column(Integer, nullable=False)
+    tip_hash = Column(String(256), nullable=False)
+    block_id = Column(Integer, ForeignKey("blocks.id"))
+    leaf_index = Column(Integer, nullable=False)
+    
+    block = relationship("Block")
+
+
 # Create tables
 Base.metadata.create_all(engine)
 
+# create_all does not add columns to existing tables
+report_columns = [c["name"] for c in inspect(engine).get_columns("reports")]
+for name, ddl in (("chain_id", "VARCHAR(128)"), ("chain_height", "INTEGER")):
+    if name not in report_columns:
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE reports ADD COLUMN {name} {ddl}"))
+
+
+def block_header(b):
+    block_data = json.loads(b.data) if b.data else {}
+    return {
+        "idx": b.id,
+        "type": block_data.get("type", "report"),
+        "block_hash": b.block_hash,
+        "previous_hash": b.previous_hash,
+        "merkle_root": b.merkle_root,
+        "timestamp": b.timestamp.isoformat() if b.timestamp else None,
+        "tx_count": len(block_data.get("evidence", block_data.get("anchors", [])))
+    }
+
+
+def subchain_header(b):
+    block_data = json.loads(b.data) if b.data else {}
+    return {
+        "chain_id": b.chain_id,
+        "height": b.height,
+        "block_hash": b.block_hash,
+        "previous_hash": b.previous_hash,
+        "merkle_root": b.merkle_root,
+        "timestamp": b.timestamp.isoformat() if b.timestamp else None,
+        "tx_count": len(block_data.get("evidence", []))
+    }
+
+
+def fetch_block_headers(after=None, limit=256):
+    # Runs outside request context (block watcher), so route through the router directly
+    with router.reader({"blocks": after or 0}) as db_session:
+        query = db_session.query(Block)
+        if after is None:
+            blocks = query.order_by(Block.id.desc()).limit(limit).all()[::-1]
+        else:
+            blocks = query.filter(Block.id > after).order_by(Block.id).limit(limit).all()
+        return [block_header(b) for b in blocks]
+
+
+# Push of newly sealed blocks to /api/chain/stream and /api/chain/poll subscribers
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("BLOCK_STREAM_HEARTBEAT_SECONDS", 15))
+block_stream = BlockBroadcaster(
+    fetch_block_headers,
+    capacity=int(os.getenv("BLOCK_STREAM_BUFFER", 256)),
+    poll_interval=float(os.getenv("BLOCK_STREAM_POLL_SECONDS", 2)),
+    max_subscribers=int(os.getenv("BLOCK_STREAM_MAX_SUBSCRIBERS", 0)),
+)
+
+PRIVATE_KEY_PATH = os.path.join(os.path.dirname(__file__), "keys", "issuer_priv.pem")
+CHAIN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+SUBCHAIN_APPEND_RETRIES = 5
+
+
+# Arbitrary advisory lock key shared by every process appending to the root chain
+ROOT_CHAIN_LOCK_KEY = 0x424C4B57
+
+
+def lock_root_chain(db_session):
+    # Serializes root appends across workers until the transaction ends (PostgreSQL only)
+    if db_session.get_bind().dialect.name == "postgresql":
+        db_session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROOT_CHAIN_LOCK_KEY})
+
+
+def append_root_block(db_session, block_data, merkle, dependents=None):
+    """Append a block to the root chain and return it, or None if a concurrent append conflicted.
+
+    `dependents(block)` returns extra rows committed in the same transaction as the block.
+    """
+    lock_root_chain(db_session)
+    previous = db_session.query(Block).order_by(Block.id.desc()).first()
+    previous_hash = previous.block_hash if previous else "0" * 64
+    block_hash = hashlib.sha256(f"{previous_hash}{block_data}".encode()).hexdigest()
+    
+    new_block = Block(
+        block_hash=block_hash,
+        previous_hash=previous_hash,
+        data=block_data,
+        merkle_root=merkle
+    )
+    db_session.add(new_block)
+    try:
+        db_session.flush()
+        if dependents:
+            db_session.add_all(dependents(new_block))
+        db_session.commit()
+    except IntegrityError:
+        db_session.rollback()
+        return None
+    db_session.refresh(new_block)
+    note_write("blocks", new_block.id)
+    block_stream.publish(block_header(new_block))
+    return new_block
+
+
+def append_subchain_block(db_session, chain_id, fields, merkle):
+    # Each sub-chain has its own tip, so appends to different chains never contend.
+    # Racing appends to the same chain collide on (chain_id, height) and retry.
+    for _ in range(SUBCHAIN_APPEND_RETRIES):
+        tip = db_session.query(SubChainBlock).filter_by(chain_id=chain_id).order_by(SubChainBlock.height.desc()).first()
+        previous_hash = tip.block_hash if tip else "0" * 64
+        height = tip.height + 1 if tip else 1
+        
+        block_data = json.dumps({"chain_id": chain_id, "height": height, **fields})
+        block_hash = hashlib.sha256(f"{previous_hash}{block_data}".encode()).hexdigest()
+        
+        new_block = SubChainBlock(
+            chain_id=chain_id,
+            height=height,
+            block_hash=block_hash,
+            previous_hash=previous_hash,
+            data=block_data,
+            merkle_root=merkle
+        )
+        db_session.add(new_block)
+        try:
+            db_session.commit()
+        except IntegrityError:
+            db_session.rollback()
+            continue
+        db_session.refresh(new_block)
+        note_write("subchain_blocks", new_block.id)
+        return new_block
+    return None
+
+
+def anchor_subchains(db_session):
+    """Commit every sub-chain tip that advanced since its last anchor into one root block.
+
+    Returns None when there is nothing to anchor or another process anchored the same tips first.
+    """
+    # Take the root chain lock before reading tips so concurrent anchoring sees this one's rows
+    lock_root_chain(db_session)
+    tips = db_session.query(
+        SubChainBlock.chain_id, func.max(SubChainBlock.height)
+    ).group_by(SubChainBlock.chain_id).all()
+    anchored = dict(db_session.query(
+        SubChainAnchor.chain_id, func.max(SubChainAnchor.height)
+    ).group_by(SubChainAnchor.chain_id).all())
+    
+    entries = []
+    for chain_id, height in sorted(tips):
+        if height > (anchored.get(chain_id) or 0):
+            tip = db_session.query(SubChainBlock).filter_by(chain_id=chain_id, height=height).first()
+            entries.append({"chain_id": chain_id, "height": height, "tip_hash": tip.block_hash})
+    if not entries:
+        db_session.rollback()
+        return None
+    
+    leaves = [anchor_leaf(e["chain_id"], e["height"], e["tip_hash"]) for e in entries]
+    root = merkle_root(leaves)
+    block_data = json.dumps({
+        "type": "anchor",
+        "anchors": entries,
+        "merkle_root": root,
+        "signature": sign_hex(PRIVATE_KEY_PATH, root),
+        "timestamp": datetime.utcnow().isoformat()
+    })
+    return append_root_block(db_session, block_data, root, dependents=lambda block: [
+        SubChainAnchor(block_id=block.id, leaf_index=i, **e) for i, e in enumerate(entries)
+    ])
+
+
+def subchain_anchor_for(db_session, block):
+    # First anchor at or above this height covers the block
+    return db_session.query(SubChainAnchor).filter(
+        SubChainAnchor.chain_id == block.chain_id,
+        SubChainAnchor.height >= block.height
+    ).order_by(SubChainAnchor.height).first()
+
+
+def subchain_proof(db_session, block):
+    """Link a sub-chain block to the root anchor block that commits to its chain tip."""
+    anchor = subchain_anchor_for(db_session, block)
+    if not anchor:
+        return {"anchored": False}
+    
+    links = db_session.query(SubChainBlock).filter(
+        SubChainBlock.chain_id == block.chain_id,
+        SubChainBlock.height > block.height,
+        SubChainBlock.height <= anchor.height
+    ).order_by(SubChainBlock.height).all()
+    linked = True
+    previous = block.block_hash
+    for b in links:
+        linked = linked and b.previous_hash == previous
+        previous = b.block_hash
+    linked = linked and previous == anchor.tip_hash
+    
+    root_block = anchor.block
+    entries = json.loads(root_block.data).get("anchors", [])
+    leaves = [anchor_leaf(e["chain_id"], e["height"], e["tip_hash"]) for e in entries]
+    leaf = anchor_leaf(anchor.chain_id, anchor.height, anchor.tip_hash)
+    path = merkle_proof(leaves, anchor.leaf_index)
+    
+    return {
+        "anchored": True,
+        "verified": linked and verify_merkle_proof(leaf, path, root_block.merkle_root),
+        "links": [{
+            "height": b.height,
+            "block_hash": b.block_hash,
+            "previous_hash": b.previous_hash
+        } for b in links],
+        "anchor": {
+            "tip_height": anchor.height,
+            "tip_hash": anchor.tip_hash,
+            "leaf": leaf,
+            "merkle_path": path,
+            "merkle_root": root_block.merkle_root,
+            "root_block_index": root_block.id,
+            "root_block_hash": root_block.block_hash
+        }
+    }
+
+
+def find_subchain_block(chain_id, height):
+    # The replica check only knows this client's writes and this process's cached
+    # primary tip; a block appended through another worker since the last tip refresh
+    # can still be missing from a replica that passes it, so retry a miss on the primary
+    for make_session in (ReadSession, SessionLocal):
+        db_session = make_session()
+        block = db_session.query(SubChainBlock).filter_by(chain_id=chain_id, height=height).first()
+        if block:
+            return db_session, block
+        db_session.close()
+    return None, None
+
+
+# Every worker runs the loop; the root chain lock and the unique (chain_id, height)
+# anchor constraint keep two workers from anchoring the same tip
+SUBCHAIN_ANCHOR_SECONDS = float(os.getenv("SUBCHAIN_ANCHOR_SECONDS", 60))
+
+
+def anchor_loop():
+    while True:
+        time.sleep(SUBCHAIN_ANCHOR_SECONDS)
+        try:
+            with SessionLocal() as db_session:
+                anchor_subchains(db_session)
+        except Exception as e:
+            print(f"Sub-chain anchoring error: {e}")
+
+
+if SUBCHAIN_ANCHOR_SECONDS > 0:
+    threading.Thread(target=anchor_loop, name="subchain-anchor", daemon=True).start()
+
 # Login manager loader
 @login_manager.user_loader
 def load_user(user_id):
@@ -282,6 +602,7 @@ def google_callback():
 def create_report():
     title = request.form.get("title")
     description = request.form.get("description", "")
+    chain_id = request.form.get("chain_id", "").strip() or None
     uploader = current_user.username if current_user.is_authenticated else "anonymous"
     
     files = request.files.getlist("files")
@@ -292,6 +613,8 @@ def create_report():
     
     if not title or not files:
         return jsonify({"error": "Title and at least one file are required"}), 400
+    if chain_id and not CHAIN_ID_PATTERN.match(chain_id):
+        return jsonify({"error": "chain_id may only contain letters, digits, '.', '_' and '-'"}), 400
     
     evidence_list = []
     all_hashes = []
@@ -307,38 +630,31 @@ def create_report():
     
     merkle = merkle_root(all_hashes) if len(all_hashes) > 1 else all_hashes[0]
     
-    private_key_path = os.path.join(os.path.dirname(__file__), "keys", "issuer_priv.pem")
-    signature = sign_hex(private_key_path, merkle)
+    signature = sign_hex(PRIVATE_KEY_PATH, merkle)
+    
+    fields = {
+        "title": title,
+        "description": description,
+        "uploader": uploader,
+        "evidence": evidence_list,
+        "merkle_root": merkle,
+        "signature": signature,
+        "timestamp": datetime.utcnow().isoformat()
+    }
     
     with SessionLocal() as db_session:
-        blocks = db_session.query(Block).all()
-        
-        previous_hash = blocks[-1].block_hash if blocks else "0" * 64
-        
-        block_data = json.dumps({
-            "title": title,
-            "description": description,
-            "uploader": uploader,
-            "evidence": evidence_list,
-            "merkle_root": merkle,
-            "signature": signature,
-            "timestamp": datetime.utcnow().isoformat()
-        })
-        
-        block_hash = hashlib.sha256(f"{previous_hash}{block_data}".encode()).hexdigest()
-        
-        new_block = Block(
-            block_hash=block_hash,
-            previous_hash=previous_hash,
-            data=block_data,
-            merkle_root=merkle
-        )
-        db_session.add(new_block)
-        db_session.commit()
-        db_session.refresh(new_block)
+        if chain_id:
+            new_block = append_subchain_block(db_session, chain_id, fields, merkle)
+            if not new_block:
+                return jsonify({"error": "Sub-chain is busy, please retry"}), 409
+        else:
+            new_block = append_root_block(db_session, json.dumps(fields), merkle)
+            if not new_block:
+                return jsonify({"error": "Chain is busy, please retry"}), 409
         
         user_id = current_user.id
         
+        reports = []
         for ev in evidence_list:
             report = Report(
                 user_id=user_id,
@@ -346,27 +662,40 @@ def create_report():
                 description=description,
                 file_hash=ev["hash"],
                 signature=signature,
-                block_index=new_block.id
+                block_index=None if chain_id else new_block.id,
+                chain_id=chain_id,
+                chain_height=new_block.height if chain_id else None
             )
             db_session.add(report)
+            reports.append(report)
         
         db_session.commit()
+        note_write("reports", max(r.id for r in reports))
         
-        return jsonify({
+        result = {
             "message": "Report created and added to blockchain",
             "report_id": new_block.id,
             "block_index": new_block.id,
             "merkle_root": merkle,
             "evidence": evidence_list,
             "signature": signature
-        }), 201
+        }
+        if chain_id:
+            # Sub-chain blocks are addressed by (chain_id, height), not a root block index
+            result.update({
+                "report_id": reports[0].id,
+                "block_index": None,
+                "chain_id": chain_id,
+                "height": new_block.height
+            })
+        return jsonify(result), 201
 
 
 @app.route("/api/search", methods=["GET"])
 def search_reports():
     query = request.args.get("q", "")
     
-    with SessionLocal() as db_session:
+    with ReadSession() as db_session:
         reports = db_session.query(Report).filter(
             Report.title.ilike(f"%{query}%") | Report.description.ilike(f"%{query}%")
         ).all()
@@ -377,17 +706,37 @@ def search_reports():
             "description": r.description,
             "file_hash": r.file_hash,
             "block_index": r.block_index,
+            "chain_id": r.chain_id,
+            "height": r.chain_height,
             "created_at": r.created_at.isoformat() if r.created_at else None
         } for r in reports])
 
 
 @app.route("/api/report/<int:report_id>/certificate", methods=["GET"])
 def download_certificate(report_id):
-    with SessionLocal() as db_session:
+    # The report's block and sub-chain block commit no later than the report row
+    with ReadSession({"reports": report_id}) as db_session:
         report = db_session.query(Report).get(report_id)
         if not report:
             return jsonify({"error": "Report not found"}), 404
         
+        block_label = f"Block Index: {report.block_index}"
+        qr_block = f"Block: {report.block_index}"
+        anchor_label = None
+        if report.chain_id:
+            sub_block = db_session.query(SubChainBlock).filter_by(
+                chain_id=report.chain_id, height=report.chain_height
+            ).first()
+            if sub_block:
+                block_label = f"Case Chain: {sub_block.chain_id}  Height: {sub_block.height}"
+                qr_block = f"Chain: {sub_block.chain_id}\nHeight: {sub_block.height}"
+                anchor = subchain_anchor_for(db_session, sub_block)
+                if anchor:
+                    anchor_label = f"Anchored in root block {anchor.block_id} (tip height {anchor.height})"
+                    qr_block += f"\nAnchor: {anchor.block_id}"
+                else:
+                    anchor_label = "Not yet anchored in the root chain"
+        
         os.makedirs("certificates", exist_ok=True)
         cert_path = f"certificates/report_{report_id}_certificate.pdf"
         
@@ -407,7 +756,7 @@ def download_certificate(report_id):
         pdf.cell(0, 10, f"Report: {report.title}", align="C")
         
         pdf.set_xy(0, 80)
-        pdf.cell(0, 10, f"Block Index: {report.block_index}", align="C")
+        pdf.cell(0, 10, block_label, align="C")
         
         pdf.set_font("Helvetica", size=12)
         pdf.set_xy(20, 100)
@@ -416,8 +765,12 @@ def download_certificate(report_id):
         pdf.set_xy(0, 130)
         pdf.cell(0, 10, f"Created: {report.created_at.strftime('%Y-%m-%d %H:%M:%S') if report.created_at else 'N/A'}", align="C")
         
+        if anchor_label:
+            pdf.set_xy(20, 150)
+            pdf.cell(200, 10, anchor_label)
+        
         qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(f"Hash: {report.file_hash}\nBlock: {report.block_index}")
+        qr.add_data(f"Hash: {report.file_hash}\n{qr_block}")
         qr.make(fit=True)
         qr_img = qr.make_image(fill_color="black", back_color="white")
         qr_path = f"certificates/qr_{report_id}.png"
@@ -432,26 +785,14 @@ def download_certificate(report_id):
 # Blockchain Explorer Routes
 @app.route("/api/explorer", methods=["GET"])
 def explorer():
-    with SessionLocal() as db_session:
+    with ReadSession() as db_session:
         blocks = db_session.query(Block).order_by(Block.id.desc()).all()
-        result = []
-        for b in blocks:
-            block_data = json.loads(b.data) if b.data else {}
-            evidence = block_data.get("evidence", [])
-            result.append({
-                "idx": b.id,
-                "block_hash": b.block_hash,
-                "previous_hash": b.previous_hash,
-                "merkle_root": b.merkle_root,
-                "timestamp": b.timestamp.isoformat() if b.timestamp else None,
-                "tx_count": len(evidence)
-            })
-        return jsonify(result)
+        return jsonify([block_header(b) for b in blocks])
 
 
 @app.route("/api/block/<int:idx>", methods=["GET"])
 def get_block(idx):
-    with SessionLocal() as db_session:
+    with ReadSession({"blocks": idx}) as db_session:
         block = db_session.query(Block).get(idx)
         if not block:
             return jsonify({"error": "Block not found"}), 404
@@ -459,7 +800,7 @@ def get_block(idx):
         block_data = json.loads(block.data) if block.data else {}
         evidence = block_data.get("evidence", [])
         
-        reports = db_session.query(Report).filter_by(block_index=block.id).all()
+        reports = db_session.query(Report).filter_by(block_index=block.id, chain_id=None).all()
         report_map = {r.file_hash: r.id for r in reports}
         
         transactions = []
@@ -480,13 +821,14 @@ def get_block(idx):
             "previous_hash": block.previous_hash,
             "merkle_root": block.merkle_root,
             "timestamp": block.timestamp.isoformat() if block.timestamp else None,
-            "transactions": transactions
+            "transactions": transactions,
+            "anchors": block_data.get("anchors", [])
         })
 
 
 @app.route("/api/block/<int:idx>/qr", methods=["GET"])
 def get_block_qr(idx):
-    with SessionLocal() as db_session:
+    with ReadSession({"blocks": idx}) as db_session:
         block = db_session.query(Block).get(idx)
         if not block:
             return jsonify({"error": "Block not found"}), 404
@@ -507,7 +849,7 @@ def get_block_qr(idx):
 
 @app.route("/api/block/<int:idx>/merkle", methods=["GET"])
 def get_merkle_proof(idx):
-    with SessionLocal() as db_session:
+    with ReadSession({"blocks": idx}) as db_session:
         block = db_session.query(Block).get(idx)
         if not block:
             return jsonify({"error": "Block not found"}), 404
@@ -530,26 +872,37 @@ def verify_file():
     file_bytes = file.read()
     file_hash = sha256_bytes(file_bytes)
     
-    with SessionLocal() as db_session:
+    with ReadSession() as db_session:
         report = db_session.query(Report).filter_by(file_hash=file_hash).first()
         
         if report:
-            block = db_session.query(Block).get(report.block_index) if report.block_index else None
+            if report.chain_id:
+                block = db_session.query(SubChainBlock).filter_by(
+                    chain_id=report.chain_id, height=report.chain_height
+                ).first()
+            else:
+                block = db_session.query(Block).get(report.block_index) if report.block_index else None
             block_data = json.loads(block.data) if block and block.data else {}
             
+            match = {
+                "hash": file_hash,
+                "report_id": report.id,
+                "title": report.title,
+                "block_index": report.block_index,
+                "uploader": block_data.get("uploader", "Unknown"),
+                "timestamp": block.timestamp.isoformat() if block and block.timestamp else None,
+                "merkle_root": block.merkle_root if block else None
+            }
+            if report.chain_id and block:
+                match["chain_id"] = block.chain_id
+                match["height"] = block.height
+                match["proof"] = subchain_proof(db_session, block)
+            
             return jsonify({
                 "found": True,
                 "verified": True,
                 "message": "File is verified and exists on the blockchain",
-                "match": {
-                    "hash": file_hash,
-                    "report_id": report.id,
-                    "title": report.title,
-                    "block_index": report.block_index,
-                    "uploader": block_data.get("uploader", "Unknown"),
-                    "timestamp": block.timestamp.isoformat() if block and block.timestamp else None,
-                    "merkle_root": block.merkle_root if block else None
-                }
+                "match": match
             })
         
         return jsonify({
@@ -563,7 +916,7 @@ def verify_file():
 # Chain Operations
 @app.route("/api/chain/timeline", methods=["GET"])
 def get_timeline():
-    with SessionLocal() as db_session:
+    with ReadSession() as db_session:
         blocks = db_session.query(Block).order_by(Block.timestamp.desc()).limit(20).all()
         result = []
         for b in blocks:
@@ -585,12 +938,114 @@ def get_timeline():
         return jsonify(result)
 
 
+def parse_after(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_timeout(value, default=25, limit=60):
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return default
+    if math.isnan(timeout):
+        return default
+    return min(max(timeout, 0), limit)
+
+
+def backfill_pages(after, buffered):
+    """Page blocks after `after` out of the database until they reach the buffered headers.
+
+    Used when blocks after `after` already left the shared buffer; only this one
+    connection reads from the database.
+    """
+    first_buffered = min((h["idx"] for h in buffered), default=None)
+    while True:
+        page = fetch_block_headers(after, block_stream.capacity)
+        if page:
+            yield page
+        if len(page) < block_stream.capacity:
+            return
+        if first_buffered is not None and page[-1]["idx"] >= first_buffered:
+            return
+        after = page[-1]["idx"]
+
+
+@app.route("/api/chain/stream", methods=["GET"])
+def stream_blocks():
+    if not block_stream.subscribe():
+        return jsonify({"error": "Too many stream subscribers"}), 503
+    
+    after = parse_after(request.headers.get("Last-Event-ID") or request.args.get("after"))
+    if after is None:
+        after = block_stream.last_id
+    
+    def generate(after):
+        headers, complete, cursor = block_stream.snapshot(after)
+        backfill = [] if complete else backfill_pages(after, headers)
+        # Ids can commit out of order, so live delivery follows arrival order and
+        # recently sent ids are remembered to skip repeats after a backfill
+        sent = deque(maxlen=block_stream.capacity)
+        yield "retry: 5000\n\n"
+        while True:
+            # Each header is written only as fast as this client reads it; database
+            # pages are fetched one at a time as the client catches up
+            for h in itertools.chain(itertools.chain.from_iterable(backfill), headers):
+                if h["idx"] not in sent:
+                    sent.append(h["idx"])
+                    yield f"id: {h['idx']}\nevent: block\ndata: {json.dumps(h)}\n\n"
+            
+            headers, cursor, overflowed = block_stream.wait(cursor, STREAM_HEARTBEAT_SECONDS)
+            backfill = []
+            if overflowed:
+                resume = max(max(sent, default=after) - block_stream.repoll_window, 0)
+                backfill = backfill_pages(resume, headers)
+            elif not headers:
+                yield ": keepalive\n\n"
+    
+    response = Response(generate(after), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    # Runs even when the client disconnects before the generator starts
+    response.call_on_close(block_stream.unsubscribe)
+    return response
+
+
+@app.route("/api/chain/poll", methods=["GET"])
+def poll_blocks():
+    timeout = parse_timeout(request.args.get("timeout"))
+    if not block_stream.subscribe():
+        return jsonify({"error": "Too many stream subscribers"}), 503
+    
+    after = parse_after(request.args.get("after"))
+    if after is None:
+        after = block_stream.last_id
+    try:
+        headers, complete = block_stream.wait_since(after, timeout)
+        if not complete:
+            # Return one database page; the client continues from its last id
+            page = fetch_block_headers(after, block_stream.capacity)
+            if page:
+                headers = page
+    finally:
+        block_stream.unsubscribe()
+    
+    return jsonify({
+        "blocks": headers,
+        "last_id": headers[-1]["idx"] if headers else after
+    })
+
+
 @app.route("/api/chain/verify", methods=["GET"])
 def verify_chain():
-    with SessionLocal() as db_session:
+    with ReadSession() as db_session:
         blocks = db_session.query(Block).order_by(Block.id).all()
+        sub_blocks = db_session.query(SubChainBlock).order_by(SubChainBlock.chain_id, SubChainBlock.height).all()
         
-        if not blocks:
+        if not blocks and not sub_blocks:
             return jsonify({"valid": True, "message": "Chain is empty"})
         
         for i in range(1, len(blocks)):
@@ -601,10 +1056,157 @@ def verify_chain():
                     "block_index": blocks[i].id
                 })
         
+        tips = {}
+        for b in sub_blocks:
+            previous = tips.get(b.chain_id)
+            expected = previous.block_hash if previous else "0" * 64
+            expected_height = previous.height + 1 if previous else 1
+            if b.previous_hash != expected or b.height != expected_height:
+                return jsonify({
+                    "valid": False,
+                    "message": f"Sub-chain {b.chain_id} broken at height {b.height}",
+                    "chain_id": b.chain_id,
+                    "height": b.height
+                })
+            tips[b.chain_id] = b
+        
+        # Anchor blocks must commit to exactly the entries they list
+        anchor_entries = {}
+        for b in blocks:
+            block_data = json.loads(b.data) if b.data else {}
+            if block_data.get("type") != "anchor":
+                continue
+            entries = block_data.get("anchors") or []
+            leaves = [anchor_leaf(e.get("chain_id"), e.get("height"), e.get("tip_hash")) for e in entries]
+            if merkle_root(leaves) != b.merkle_root:
+                return jsonify({
+                    "valid": False,
+                    "message": f"Anchor block {b.id} Merkle root does not match its anchors",
+                    "block_index": b.id
+                })
+            for i, e in enumerate(entries):
+                anchor_entries[(b.id, i)] = e
+        
+        # Every anchor record must be the leaf it points at, and every leaf must have a record
+        by_height = {(b.chain_id, b.height): b.block_hash for b in sub_blocks}
+        for anchor in db_session.query(SubChainAnchor).all():
+            entry = anchor_entries.pop((anchor.block_id, anchor.leaf_index), None)
+            recorded = {"chain_id": anchor.chain_id, "height": anchor.height, "tip_hash": anchor.tip_hash}
+            if entry != recorded or by_height.get((anchor.chain_id, anchor.height)) != anchor.tip_hash:
+                return jsonify({
+                    "valid": False,
+                    "message": f"Anchor in block {anchor.block_id} does not match sub-chain {anchor.chain_id} at height {anchor.height}",
+                    "block_index": anchor.block_id,
+                    "chain_id": anchor.chain_id
+                })
+        if anchor_entries:
+            (block_id, leaf_index), entry = min(anchor_entries.items())
+            return jsonify({
+                "valid": False,
+                "message": f"Anchor block {block_id} leaf {leaf_index} has no anchor record",
+                "block_index": block_id,
+                "chain_id": entry.get("chain_id")
+            })
+        
         return jsonify({
             "valid": True,
             "message": "Blockchain integrity verified",
-            "total_blocks": len(blocks)
+            "total_blocks": len(blocks),
+            "total_subchains": len(tips),
+            "total_subchain_blocks": len(sub_blocks)
+        })
+
+
+# Sub-chain Routes
+@app.route("/api/chains", methods=["GET"])
+def list_subchains():
+    with ReadSession() as db_session:
+        tips = db_session.query(
+            SubChainBlock.chain_id, func.max(SubChainBlock.height)
+        ).group_by(SubChainBlock.chain_id).all()
+        anchored = dict(db_session.query(
+            SubChainAnchor.chain_id, func.max(SubChainAnchor.height)
+        ).group_by(SubChainAnchor.chain_id).all())
+        
+        result = []
+        for chain_id, height in sorted(tips):
+            tip = db_session.query(SubChainBlock).filter_by(chain_id=chain_id, height=height).first()
+            result.append({
+                "chain_id": chain_id,
+                "height": height,
+                "tip_hash": tip.block_hash,
+                "anchored_height": anchored.get(chain_id) or 0
+            })
+        return jsonify(result)
+
+
+@app.route("/api/chains/anchor", methods=["POST"])
+@login_required
+def anchor_chains():
+    with SessionLocal() as db_session:
+        anchor_block = anchor_subchains(db_session)
+        if not anchor_block:
+            return jsonify({"message": "No unanchored sub-chain tips", "anchored": []})
+        
+        return jsonify({
+            "message": "Sub-chain tips anchored into the root chain",
+            "block_index": anchor_block.id,
+            "merkle_root": anchor_block.merkle_root,
+            "anchored": json.loads(anchor_block.data)["anchors"]
+        }), 201
+
+
+@app.route("/api/chains/<chain_id>", methods=["GET"])
+def subchain_explorer(chain_id):
+    with ReadSession() as db_session:
+        blocks = db_session.query(SubChainBlock).filter_by(chain_id=chain_id).order_by(SubChainBlock.height.desc()).all()
+        if not blocks:
+            return jsonify({"error": "Sub-chain not found"}), 404
+        return jsonify([subchain_header(b) for b in blocks])
+
+
+@app.route("/api/chains/<chain_id>/block/<int:height>", methods=["GET"])
+def get_subchain_block(chain_id, height):
+    db_session, block = find_subchain_block(chain_id, height)
+    if not block:
+        return jsonify({"error": "Block not found"}), 404
+    
+    with db_session:
+        block_data = json.loads(block.data) if block.data else {}
+        reports = db_session.query(Report).filter_by(chain_id=chain_id, chain_height=block.height).all()
+        report_map = {r.file_hash: r.id for r in reports}
+        
+        transactions = []
+        for ev in block_data.get("evidence", []):
+            transactions.append({
+                "tx_id": ev.get("hash", "")[:16],
+                "title": block_data.get("title", "Untitled"),
+                "uploader": block_data.get("uploader", "Unknown"),
+                "report_id": report_map.get(ev.get("hash"), None),
+                "hash": ev.get("hash", ""),
+                "filename": ev.get("filename", "")
+            })
+        
+        anchor = subchain_anchor_for(db_session, block)
+        return jsonify({
+            **subchain_header(block),
+            "transactions": transactions,
+            "anchor_block_index": anchor.block_id if anchor else None
+        })
+
+
+@app.route("/api/chains/<chain_id>/block/<int:height>/proof", methods=["GET"])
+def get_subchain_proof(chain_id, height):
+    db_session, block = find_subchain_block(chain_id, height)
+    if not block:
+        return jsonify({"error": "Block not found"}), 404
+    
+    with db_session:
+        return jsonify({
+            "chain_id": block.chain_id,
+            "height": block.height,
+            "block_hash": block.block_hash,
+            **subchain_proof(db_session, block)
         })
 
 
@@ -620,7 +1222,7 @@ def db_test():
     try:
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
-        return jsonify({"status": "Database Connected"})
+        return jsonify({"status": "Database Connected", "routing": router.status()})
     except Exception as e:
         return jsonify({"status": "Database Error", "message": str(e)})
 
@@ -0,0 +1,142 @@
+# backend/block_events.py
+import bisect
+import threading
+import time
+
+
+class BlockBroadcaster:
+    """In-process fan-out of newly sealed block headers to stream subscribers.
+
+    Headers are kept in a bounded buffer shared by every subscriber, so each
+    connection only tracks its own cursor. A subscriber that falls behind the
+    buffer backfills from the database once instead of the broadcaster queueing
+    per-connection data.
+
+    Block ids are assigned at INSERT time, so they can commit out of order (id 11
+    before id 10). The buffer is therefore sorted by id, live subscribers follow
+    the arrival sequence rather than the id, and the watcher re-polls a trailing
+    window of ids so late commits from other workers are still picked up.
+    """
+
+    def __init__(self, fetch_headers, capacity=256, poll_interval=2.0, max_subscribers=0, repoll_window=32):
+        # fetch_headers(after, limit) -> headers with idx > after in ascending order,
+        # or the newest `limit` headers when after is None
+        self.fetch_headers = fetch_headers
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self.repoll_window = repoll_window
+        self.last_id = 0
+        self.seq = 0
+        self.subscribers = 0
+        # Every block id above `floor` is in the buffer, once seeded from the database
+        self.floor = 0
+        self.evicted_seq = 0
+        self._seeded = False
+        self._buffer = []  # (idx, seq, header) sorted by idx
+        self._ids = set()
+        self._cond = threading.Condition()
+        self._watcher = None
+
+    def publish(self, header):
+        with self._cond:
+            self._publish(header)
+
+    def _publish(self, header):
+        idx = header["idx"]
+        if idx in self._ids or idx <= self.floor:
+            return
+        self.seq += 1
+        bisect.insort(self._buffer, (idx, self.seq, header))
+        self._ids.add(idx)
+        self.last_id = max(self.last_id, idx)
+        if len(self._buffer) > self.capacity:
+            old_idx, old_seq, _ = self._buffer.pop(0)
+            self._ids.discard(old_idx)
+            self.floor = old_idx
+            self.evicted_seq = max(self.evicted_seq, old_seq)
+        self._cond.notify_all()
+
+    def since(self, after):
+        """Return (headers, complete); complete is False when blocks after `after` may be missing."""
+        with self._cond:
+            return self._since(after)
+
+    def _since(self, after):
+        headers = [h for idx, _, h in self._buffer if idx > after]
+        return headers, self._seeded and after >= self.floor
+
+    def snapshot(self, after):
+        """Return (headers, complete, cursor): headers after block id `after` plus the arrival cursor to follow."""
+        with self._cond:
+            headers, complete = self._since(after)
+            return headers, complete, self.seq
+
+    def wait(self, cursor, timeout):
+        """Block until a header arrives after arrival `cursor` or `timeout` elapses.
+
+        Returns (headers, cursor, overflowed); overflowed means headers that arrived
+        after `cursor` were already pushed out of the buffer.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq > cursor, timeout)
+            arrived = sorted((seq, h) for _, seq, h in self._buffer if seq > cursor)
+            return [h for _, h in arrived], self.seq, self.evicted_seq > cursor
+
+    def wait_since(self, after, timeout):
+        """Block until a header with id above `after` is buffered or `timeout` elapses."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.last_id > after, timeout)
+            return self._since(after)
+
+    def subscribe(self):
+        with self._cond:
+            if self.max_subscribers and self.subscribers >= self.max_subscribers:
+                return False
+            self.subscribers += 1
+        self.ensure_watcher()
+        return True
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def ensure_watcher(self):
+        """Start the single per-process thread that picks up blocks sealed by other workers."""
+        with self._cond:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, name="block-watcher", daemon=True)
+        # Seed the buffer before the first subscriber picks its starting cursor
+        self._seed()
+        self._watcher.start()
+
+    def _seed(self):
+        try:
+            headers = self.fetch_headers(None, self.capacity)
+        except Exception as e:
+            print(f"Block watcher error: {e}")
+            return
+        with self._cond:
+            if len(headers) >= self.capacity:
+                # Older blocks than the newest `capacity` are only in the database
+                self.floor = max(self.floor, headers[0]["idx"] - 1)
+            for header in headers:
+                self._publish(header)
+            self._seeded = True
+
+    def _poll(self):
+        try:
+            # Re-read a trailing window: a lower id can commit after a higher one
+            for header in self.fetch_headers(max(self.last_id - self.repoll_window, 0), self.capacity):
+                self.publish(header)
+        except Exception as e:
+            print(f"Block watcher error: {e}")
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            if self._seeded:
+                self._poll()
+            else:
+                self._seed()
@@ -25,3 +25,30 @@ def merkle_root(hex_hashes):
             nxt.append(hashlib.sha256(cur[i] + cur[i+1]).digest())
         cur = nxt
     return cur[0].hex()
+
+def merkle_proof(hex_hashes, index):
+    # sibling hashes from leaf to root, built the same way as merkle_root
+    proof = []
+    cur = [bytes.fromhex(h) for h in hex_hashes]
+    while len(cur) > 1:
+        if len(cur) % 2 == 1:
+            cur.append(cur[-1])
+        sibling = index ^ 1
+        proof.append({
+            "hash": cur[sibling].hex(),
+            "position": "left" if sibling < index else "right"
+        })
+        cur = [hashlib.sha256(cur[i] + cur[i+1]).digest() for i in range(0, len(cur), 2)]
+        index //= 2
+    return proof
+
+def verify_merkle_proof(leaf_hex, proof, root_hex):
+    h = bytes.fromhex(leaf_hex)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        h = hashlib.sha256(sibling + h if step["position"] == "left" else h + sibling).digest()
+    return h.hex() == root_hex
+
+def anchor_leaf(chain_id, height, tip_hash):
+    # leaf committed into a root anchor block for one sub-chain tip
+    return sha256_bytes(f"{chain_id}:{height}:{tip_hash}".encode())
@@ -0,0 +1,161 @@
+# backend/db_routing.py
+import random
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+
+def tip_query(tables):
+    # Highest id per table; a replica is caught up once it has every table's tip
+    return text("SELECT " + ", ".join(f"(SELECT COALESCE(MAX(id), 0) FROM {t})" for t in tables))
+
+
+# After a local write leaves replicas behind, re-check them this soon instead of
+# waiting out the full check interval
+MIN_RECHECK_SECONDS = 0.25
+
+
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+class ReplicaRouter:
+    """Route read-only sessions to replica engines that are caught up with the primary.
+
+    Writes always go to the primary. Progress is the highest id of each table in
+    `tip_tables`. A replica is only used when every table is within `max_lag` rows
+    of the primary and at least at `min_positions` (used for read-your-own-write),
+    otherwise the read falls back to the primary.
+    """
+
+    def __init__(self, primary_engine, replica_urls=None, max_lag=0, check_interval=5.0, connect_timeout=3,
+                 tip_tables=("blocks",)):
+        self.primary_engine = primary_engine
+        self.tip_tables = tuple(tip_tables)
+        self._tip_query = tip_query(self.tip_tables)
+        self.PrimarySession = sessionmaker(bind=primary_engine)
+        self.replicas = []
+        for url in replica_urls or []:
+            url = make_url(normalize_url(url))
+            # A hung replica should fail fast so reads fall back to the primary
+            connect_args = {"connect_timeout": connect_timeout} if url.get_backend_name() == "postgresql" else {}
+            engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+            self.replicas.append({
+                "url": engine.url.render_as_string(hide_password=True),
+                "engine": engine,
+                "session": sessionmaker(bind=engine),
+                "tip": None,
+                "error": None,
+            })
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.primary_tip = dict.fromkeys(self.tip_tables, 0)
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def _query_tip(self, engine):
+        with engine.connect() as conn:
+            row = conn.execute(self._tip_query).one()
+        return {t: value or 0 for t, value in zip(self.tip_tables, row)}
+
+    def _behind(self, tip, required):
+        return any(tip.get(t, 0) < required.get(t, 0) for t in self.tip_tables)
+
+    def refresh(self, force=False):
+        """Re-read tip heights of the primary and every replica if the cache is stale.
+
+        Only one caller queries the databases at a time; everyone else keeps using
+        the current snapshot instead of waiting on that I/O.
+        """
+        if not self.replicas:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            elapsed = time.monotonic() - self._checked_at
+            due = elapsed >= self.check_interval or (self._stale and elapsed >= MIN_RECHECK_SECONDS)
+            if not force and not due:
+                return
+            self._refreshing = True
+            self._stale = False
+
+        primary_tip = None
+        results = []
+        try:
+            try:
+                primary_tip = self._query_tip(self.primary_engine)
+            except Exception:
+                # Keep the last known tip; replicas are still compared against it
+                pass
+            for replica in self.replicas:
+                try:
+                    results.append((self._query_tip(replica["engine"]), None))
+                except Exception as e:
+                    results.append((None, str(e)))
+        finally:
+            with self._lock:
+                if primary_tip is not None:
+                    for t, value in primary_tip.items():
+                        self.primary_tip[t] = max(self.primary_tip[t], value)
+                for replica, (tip, error) in zip(self.replicas, results):
+                    replica["tip"] = tip
+                    replica["error"] = error
+                self._checked_at = time.monotonic()
+                self._refreshing = False
+
+    def _required(self, min_positions=None):
+        required = {t: tip - self.max_lag for t, tip in self.primary_tip.items()}
+        for t, position in (min_positions or {}).items():
+            if t in required:
+                required[t] = max(required[t], position or 0)
+        return required
+
+    def note_write(self, table, row_id):
+        """Record a row committed on the primary so lagging replicas are skipped immediately."""
+        with self._lock:
+            self.primary_tip[table] = max(self.primary_tip[table], row_id or 0)
+            required = self._required()
+            # Replicas usually catch up within moments; re-check soon rather than
+            # sending every read to the primary for the rest of the check interval
+            if any(r["tip"] is not None and self._behind(r["tip"], required) for r in self.replicas):
+                self._stale = True
+
+    def healthy_replicas(self, min_positions=None):
+        self.refresh()
+        with self._lock:
+            required = self._required(min_positions)
+            return [r for r in self.replicas if r["tip"] is not None and not self._behind(r["tip"], required)]
+
+    def reader(self, min_positions=None):
+        """Return a session bound to a caught-up replica, or to the primary if none qualify."""
+        candidates = self.healthy_replicas(min_positions)
+        if not candidates:
+            return self.PrimarySession()
+        return random.choice(candidates)["session"]()
+
+    def status(self):
+        self.refresh()
+        with self._lock:
+            return self._status()
+
+    def _status(self):
+        return {
+            "primary_tip": dict(self.primary_tip),
+            "max_lag": self.max_lag,
+            "replicas": [{
+                "url": r["url"],
+                "tip": r["tip"],
+                "lag": None if r["tip"] is None else max(
+                    max(self.primary_tip[t] - r["tip"].get(t, 0), 0) for t in self.tip_tables
+                ),
+                "error": r["error"],
+            } for r in self.replicas],
+        }
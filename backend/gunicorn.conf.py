@@ -0,0 +1,26 @@
+# backend/gunicorn.conf.py
+import os
+
+bind = f"localhost:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+
+# Block stream and long-poll subscribers sit idle in Condition.wait for minutes.
+# gevent workers park each connection on a greenlet instead of an OS thread, so a
+# worker holds thousands of them; the stream's own watcher and the anchor loop
+# become greenlets too because the worker patches threading before loading app.py
+worker_class = "gevent"
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", 10000))
+
+# Open streams are cut off after this long on shutdown; clients reconnect with
+# Last-Event-ID
+graceful_timeout = 10
+
+
+def post_fork(server, worker):
+    # psycopg2 blocks the whole worker while it waits on PostgreSQL unless it is
+    # told to yield to other greenlets; SQLite setups may not have psycopg2 at all
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        return
+    patch_psycopg()
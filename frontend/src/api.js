@@ -74,6 +74,36 @@ export async function verifyChain() {
   return res.json();
 }
 
+// -----------------
+// SUB-CHAINS
+// -----------------
+export async function listChains() {
+  const res = await fetchJson(`${API_BASE}/chains`);
+  return res.json();
+}
+
+export async function getChainBlocks(chainId) {
+  const res = await fetchJson(`${API_BASE}/chains/${encodeURIComponent(chainId)}`);
+  return res.json();
+}
+
+export async function getChainProof(chainId, height) {
+  const res = await fetchJson(`${API_BASE}/chains/${encodeURIComponent(chainId)}/block/${height}/proof`);
+  return res.json();
+}
+
+export async function anchorChains() {
+  const res = await fetchJson(`${API_BASE}/chains/anchor`, { method: "POST" });
+  return res.json();
+}
+
+// Push of newly sealed block headers; EventSource resumes from the last id on reconnect
+export function subscribeBlocks(onBlock) {
+  const source = new EventSource(`${API_BASE}/chain/stream`);
+  source.addEventListener("block", (e) => onBlock(JSON.parse(e.data)));
+  return () => source.close();
+}
+
 // -----------------
 // AUTH
 // -----------------
@@ -10,6 +10,7 @@ export default function CreateReport() {
   const [title, setTitle] = useState("");
   const [desc, setDesc] = useState("");
   const [uploader, setUploader] = useState("demo_user");
+  const [chainId, setChainId] = useState("");
   const [files, setFiles] = useState([]);
   const [result, setResult] = useState(null);
   const [loading, setLoading] = useState(false);
@@ -25,6 +26,7 @@ export default function CreateReport() {
     fd.append("title", title);
     fd.append("description", desc);
     fd.append("uploader", uploader);
+    if (chainId) fd.append("chain_id", chainId);
     for (const f of files) fd.append("files", f);
     try {
       const r = await createReport(fd);
@@ -87,6 +89,13 @@ export default function CreateReport() {
             }
           />
 
+          <Input
+            label="Case Chain (optional)"
+            placeholder="Case or team ID to append to its own sub-chain..."
+            value={chainId}
+            onChange={(e) => setChainId(e.target.value)}
+          />
+
           <FileUpload
             label="Evidence Files"
             multiple
@@ -152,7 +161,14 @@ export default function CreateReport() {
                   </Badge>
                 </div>
                 
-                {result.block_index !== undefined && (
+                {result.chain_id ? (
+                  <div className="flex items-center gap-3">
+                    <span className="text-sm font-medium text-dark-200 w-32">Case Chain:</span>
+                    <Badge variant="accent" size="md">
+                      {result.chain_id} · Height {result.height}
+                    </Badge>
+                  </div>
+                ) : result.block_index !== undefined && (
                   <div className="flex items-center gap-3">
                     <span className="text-sm font-medium text-dark-200 w-32">Block Index:</span>
                     <Badge variant="accent" size="md">
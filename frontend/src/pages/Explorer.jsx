@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from "react";
-import { explorer, getBlock, getBlockQr, getMerkleProof, downloadCertificate, verifyChain } from "../api";
+import { explorer, getBlock, getBlockQr, getMerkleProof, downloadCertificate, verifyChain, subscribeBlocks, listChains, getChainBlocks, getChainProof, anchorChains } from "../api";
 import MerkleVisualizer from "../components/MerkleVisualizer";
 import Button from "../components/Button";
 import Card, { GlassCard } from "../components/Card";
@@ -15,8 +15,15 @@ export default function Explorer() {
   const [showMerkle, setShowMerkle] = useState(false);
   const [chainStatus, setChainStatus] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [chains, setChains] = useState([]);
+  const [chainView, setChainView] = useState(null);
+  const [chainProof, setChainProof] = useState(null);
 
-  useEffect(() => { loadBlocks(); }, []);
+  useEffect(() => { loadBlocks(); loadChains(); }, []);
+
+  useEffect(() => subscribeBlocks((block) => {
+    setBlocks((prev) => prev.some((b) => b.idx === block.idx) ? prev : [block, ...prev]);
+  }), []);
 
   async function loadBlocks() {
     setLoading(true);
@@ -30,10 +37,49 @@ export default function Explorer() {
     }
   }
 
+  async function loadChains() {
+    try {
+      setChains(await listChains());
+    } catch (err) {
+      alert("Failed to load case chains: " + err.message);
+    }
+  }
+
+  async function openChain(chainId) {
+    try {
+      const chainBlocks = await getChainBlocks(chainId);
+      setChainView({ chainId, blocks: chainBlocks });
+      setChainProof(null);
+      setDetail(null);
+    } catch (err) {
+      alert("Failed to open case chain: " + err.message);
+    }
+  }
+
+  async function fetchChainProof(chainId, height) {
+    try {
+      setChainProof(await getChainProof(chainId, height));
+    } catch (err) {
+      alert("Failed to fetch anchor proof: " + err.message);
+    }
+  }
+
+  async function anchorTips() {
+    try {
+      const res = await anchorChains();
+      alert(res.message);
+      await loadChains();
+      if (chainView) await openChain(chainView.chainId);
+    } catch (err) {
+      alert("Anchoring failed: " + err.message);
+    }
+  }
+
   async function openBlock(idx) {
     try {
       const d = await getBlock(idx);
       setDetail(d);
+      setChainView(null);
       setQrData(null);
       setProofData(null);
       setShowMerkle(false);
@@ -145,7 +191,7 @@ export default function Explorer() {
                     <div className="flex items-center gap-2 mb-1">
                       <h3 className="font-bold text-dark-100">Block #{b.idx}</h3>
                       <Badge variant="primary" size="sm">
-                        {b.tx_count || 0} tx
+                        {b.tx_count || 0} {b.type === "anchor" ? "anchors" : "tx"}
                       </Badge>
                     </div>
                     <p className="text-xs font-mono text-dark-500">
@@ -164,10 +210,96 @@ export default function Explorer() {
               </Card>
             ))
           )}
+
+          <div className="flex items-center justify-between mt-6 mb-3">
+            <h2 className="text-lg font-semibold text-dark-100">
+              Case Chains ({chains.length})
+            </h2>
+            <Button onClick={anchorTips} variant="ghost" size="sm">
+              Anchor Tips
+            </Button>
+          </div>
+          {chains.map(c => (
+            <Card
+              key={c.chain_id}
+              hover
+              className={`p-4 cursor-pointer transition-all duration-300 ${
+                chainView?.chainId === c.chain_id
+                  ? 'border-2 border-primary-500 bg-gradient-to-br from-primary-50 to-white shadow-glow'
+                  : ''
+              }`}
+              onClick={() => openChain(c.chain_id)}
+            >
+              <div className="flex items-center gap-2 mb-1">
+                <h3 className="font-bold text-dark-100">{c.chain_id}</h3>
+                <Badge variant="primary" size="sm">Height {c.height}</Badge>
+                <Badge variant={c.anchored_height >= c.height ? "success" : "warning"} size="sm">
+                  Anchored {c.anchored_height}
+                </Badge>
+              </div>
+              <p className="text-xs font-mono text-dark-500">
+                Tip: {c.tip_hash?.slice(0, 16)}...
+              </p>
+            </Card>
+          ))}
         </div>
 
         <div className="col-span-8">
-          {detail ? (
+          {chainView ? (
+            <GlassCard className="p-6 space-y-4 animate-slide-up">
+              <h2 className="text-2xl font-bold text-dark-100">Case Chain {chainView.chainId}</h2>
+              {chainView.blocks.map(cb => (
+                <Card key={cb.height} className="p-4" hover>
+                  <div className="flex items-start justify-between">
+                    <div>
+                      <div className="flex items-center gap-2 mb-1">
+                        <h4 className="font-semibold text-dark-100">Height {cb.height}</h4>
+                        <Badge variant="primary" size="sm">{cb.tx_count || 0} tx</Badge>
+                      </div>
+                      <p className="text-xs font-mono text-dark-500 break-all">{cb.block_hash}</p>
+                    </div>
+                    <Button onClick={() => fetchChainProof(chainView.chainId, cb.height)} variant="success" size="sm">
+                      Anchor Proof
+                    </Button>
+                  </div>
+                  {chainProof?.chain_id === chainView.chainId && chainProof.height === cb.height && (
+                    <div className="mt-4 p-4 bg-dark-800 rounded-xl border border-dark-700 space-y-2">
+                      {chainProof.anchored ? (
+                        <>
+                          <div className="flex flex-wrap items-center gap-2">
+                            <Badge variant={chainProof.verified ? "success" : "danger"} size="md">
+                              {chainProof.verified ? "✓ Valid" : "✗ Invalid"}
+                            </Badge>
+                            <button
+                              onClick={() => openBlock(chainProof.anchor.root_block_index)}
+                              className="text-primary-600 hover:text-primary-700 underline text-sm"
+                            >
+                              Root Block #{chainProof.anchor.root_block_index}
+                            </button>
+                            <Badge variant="dark" size="sm">Tip Height {chainProof.anchor.tip_height}</Badge>
+                          </div>
+                          <p className="text-xs text-dark-300">
+                            Hash links to tip: {chainProof.links.length}
+                          </p>
+                          <p className="text-xs text-dark-300">Merkle path to anchor root:</p>
+                          {chainProof.anchor.merkle_path.map((step, i) => (
+                            <code key={i} className="block text-xs font-mono text-dark-200 break-all">
+                              {step.position}: {step.hash}
+                            </code>
+                          ))}
+                          <p className="text-xs font-mono text-dark-500 break-all">
+                            Root: {chainProof.anchor.merkle_root}
+                          </p>
+                        </>
+                      ) : (
+                        <Badge variant="warning" size="md">Not yet anchored in the root chain</Badge>
+                      )}
+                    </div>
+                  )}
+                </Card>
+              ))}
+            </GlassCard>
+          ) : detail ? (
             <GlassCard className="p-6 space-y-6 animate-slide-up">
               <div>
                 <h2 className="text-2xl font-bold text-dark-100 mb-4 flex items-center gap-3">
@@ -205,6 +337,23 @@ export default function Explorer() {
                 </div>
               </div>
 
+              {detail.anchors?.length > 0 && (
+                <div>
+                  <h3 className="text-lg font-bold text-dark-100 mb-3">Anchored Case Chain Tips</h3>
+                  <div className="space-y-2">
+                    {detail.anchors.map(a => (
+                      <Card key={a.chain_id} className="p-3 cursor-pointer" hover onClick={() => openChain(a.chain_id)}>
+                        <div className="flex items-center gap-2">
+                          <h4 className="font-semibold text-dark-100">{a.chain_id}</h4>
+                          <Badge variant="primary" size="sm">Height {a.height}</Badge>
+                        </div>
+                        <p className="text-xs font-mono text-dark-500 break-all">{a.tip_hash}</p>
+                      </Card>
+                    ))}
+                  </div>
+                </div>
+              )}
+
               <div>
                 <h3 className="text-lg font-bold text-dark-100 mb-3">Transactions</h3>
                 <div className="space-y-3">
@@ -109,7 +109,7 @@ export default function Search() {
                       {r.uploader}
                     </Badge>
                     <Badge variant="accent" size="sm">
-                      Block #{r.block_index}
+                      {r.chain_id ? `${r.chain_id} · Height ${r.height}` : `Block #${r.block_index}`}
                     </Badge>
                     <Badge variant="dark" size="sm" className="font-mono text-xs">
                       {r.tx_id}
@@ -121,12 +121,21 @@ export default function Verify() {
                         {result.match.hash}
                       </code>
                     </div>
-                    <div>
-                      <p className="text-sm font-medium text-dark-300 mb-2">Block Index</p>
-                      <Badge variant="accent" size="lg" className="text-base">
-                        #{result.match.block_index}
-                      </Badge>
-                    </div>
+                    {result.match.chain_id ? (
+                      <div>
+                        <p className="text-sm font-medium text-dark-300 mb-2">Case Chain</p>
+                        <Badge variant="accent" size="lg" className="text-base">
+                          {result.match.chain_id} · Height {result.match.height}
+                        </Badge>
+                      </div>
+                    ) : (
+                      <div>
+                        <p className="text-sm font-medium text-dark-300 mb-2">Block Index</p>
+                        <Badge variant="accent" size="lg" className="text-base">
+                          #{result.match.block_index}
+                        </Badge>
+                      </div>
+                    )}
                   </div>
 
                   {result.match.report_id && (
@@ -168,6 +177,32 @@ export default function Verify() {
                     </div>
                   )}
 
+                  {result.match.proof && (
+                    <div>
+                      <p className="text-sm font-medium text-dark-300 mb-2">Root Chain Anchor</p>
+                      {result.match.proof.anchored ? (
+                        <div className="space-y-2">
+                          <div className="flex flex-wrap items-center gap-2">
+                            <Badge variant={result.match.proof.verified ? "success" : "danger"} size="md">
+                              {result.match.proof.verified ? "✓ Proof Valid" : "✗ Proof Invalid"}
+                            </Badge>
+                            <Badge variant="accent" size="md">
+                              Root Block #{result.match.proof.anchor.root_block_index}
+                            </Badge>
+                            <Badge variant="dark" size="md">
+                              Anchored at Height {result.match.proof.anchor.tip_height}
+                            </Badge>
+                          </div>
+                          <p className="text-xs text-dark-300">
+                            {result.match.proof.links.length} sub-chain link(s) to the anchored tip, {result.match.proof.anchor.merkle_path.length} Merkle step(s) to the anchor root
+                          </p>
+                        </div>
+                      ) : (
+                        <Badge variant="warning" size="md">Not yet anchored in the root chain</Badge>
+                      )}
+                    </div>
+                  )}
+
                   <div className="mt-6 p-4 bg-success-100 border border-success-300 rounded-xl">
                     <div className="flex items-start gap-3">
                       <svg className="w-5 h-5 text-success-700 flex-shrink-0 mt-0.5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -1,7 +1,9 @@
 #!/bin/bash
 
-# Start the Flask backend on port 8000
-cd backend && python app.py &
+# Start the Flask backend on port 8000. The schema is set up once before the
+# workers start; gevent workers keep idle block stream subscribers on greenlets,
+# see backend/gunicorn.conf.py
+cd backend && python -c "import app" && gunicorn -c gunicorn.conf.py app:app &
 BACKEND_PID=$!
 
 # Wait a moment for backend to initialize